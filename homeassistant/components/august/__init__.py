@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Coroutine, Iterable, ValuesView
+from collections.abc import Callable, Coroutine, Sequence, ValuesView
 from datetime import datetime
-from itertools import chain
+from http import HTTPStatus
 import logging
+from operator import attrgetter
 from typing import Any, ParamSpec, TypeVar
 
 from aiohttp import ClientError, ClientResponseError
@@ -17,7 +18,6 @@ from yalexs.exceptions import AugustApiAIOHTTPError
 from yalexs.lock import Lock, LockDetail
 from yalexs.pubnub_activity import activities_from_pubnub_message
 from yalexs.pubnub_async import AugustPubNub, async_create_pubnub
-from yalexs_ble import YaleXSBLEDiscovery
 
 from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY, ConfigEntry
 from homeassistant.const import CONF_PASSWORD
@@ -34,27 +34,30 @@ from .const import CONF_BRAND, DOMAIN, MIN_TIME_BETWEEN_DETAIL_UPDATES, PLATFORM
 from .exceptions import CannotConnect, InvalidAuth, RequireValidation
 from .gateway import AugustGateway
 from .subscriber import AugustSubscriberMixin
-from .util import async_create_august_clientsession
+from .util import async_get_august_clientsession
 
 _R = TypeVar("_R")
 _P = ParamSpec("_P")
 
 _LOGGER = logging.getLogger(__name__)
 
-API_CACHED_ATTRS = {
+API_CACHED_ATTRS = (
     "door_state",
     "door_state_datetime",
     "lock_status",
     "lock_status_datetime",
-}
+)
+_get_live_attrs = attrgetter(*API_CACHED_ATTRS)
+_get_house_id = attrgetter("house_id")
 YALEXS_BLE_DOMAIN = "yalexs_ble"
+MAX_CONCURRENT_DETAIL_REFRESHES = 5
 
 type AugustConfigEntry = ConfigEntry[AugustData]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up August from a config entry."""
-    session = async_create_august_clientsession(hass)
+    session = async_get_august_clientsession(hass)
     august_gateway = AugustGateway(hass, session)
 
     try:
@@ -107,21 +110,38 @@ def _async_trigger_ble_lock_discovery(
             hass,
             YALEXS_BLE_DOMAIN,
             context={"source": SOURCE_INTEGRATION_DISCOVERY},
-            data=YaleXSBLEDiscovery(
-                {
-                    "name": lock_detail.device_name,
-                    "address": lock_detail.mac_address,
-                    "serial": lock_detail.serial_number,
-                    "key": lock_detail.offline_key,
-                    "slot": lock_detail.offline_slot,
-                }
-            ),
+            # The data matches the yalexs_ble YaleXSBLEDiscovery TypedDict
+            # which is not imported to avoid loading yalexs_ble at startup
+            data={
+                "name": lock_detail.device_name,
+                "address": lock_detail.mac_address,
+                "serial": lock_detail.serial_number,
+                "key": lock_detail.offline_key,
+                "slot": lock_detail.offline_slot,
+            },
         )
 
 
 class AugustData(AugustSubscriberMixin):
     """August data object."""
 
+    __slots__ = (
+        "_config_entry",
+        "_august_gateway",
+        "activity_stream",
+        "_api",
+        "_device_detail_by_id",
+        "_doorbells_by_id",
+        "_locks_by_id",
+        "_device_name_by_id",
+        "_hyper_bridge_by_id",
+        "_house_ids",
+        "_pubnub_unsub",
+        "_last_message_time_by_device_id",
+        "_token",
+        "_token_unsub",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -138,8 +158,20 @@ class AugustData(AugustSubscriberMixin):
         self._device_detail_by_id: dict[str, LockDetail | DoorbellDetail] = {}
         self._doorbells_by_id: dict[str, Doorbell] = {}
         self._locks_by_id: dict[str, Lock] = {}
+        self._device_name_by_id: dict[str, str] = {}
+        self._hyper_bridge_by_id: dict[str, bool] = {}
         self._house_ids: set[str] = set()
         self._pubnub_unsub: CALLBACK_TYPE | None = None
+        self._last_message_time_by_device_id: dict[str, datetime] = {}
+        self._token = august_gateway.access_token
+        self._token_unsub = august_gateway.async_subscribe_access_token(
+            self._async_access_token_updated
+        )
+
+    @callback
+    def _async_access_token_updated(self, token: str) -> None:
+        """Store the refreshed access token."""
+        self._token = token
 
     @property
     def brand(self) -> str:
@@ -148,22 +180,45 @@ class AugustData(AugustSubscriberMixin):
 
     async def async_setup(self) -> None:
         """Async setup of august device data and activities."""
-        token = self._august_gateway.access_token
-        # This used to be a gather but it was less reliable with august's recent api changes.
-        user_data = await self._api.async_get_user(token)
-        locks: list[Lock] = await self._api.async_get_operable_locks(token)
-        doorbells: list[Doorbell] = await self._api.async_get_doorbells(token)
+        token = self._token
+        user_data: dict[str, Any]
+        locks: list[Lock]
+        doorbells: list[Doorbell]
+        try:
+            async with asyncio.TaskGroup() as tg:
+                user_task = tg.create_task(self._api.async_get_user(token))
+                locks_task = tg.create_task(self._api.async_get_operable_locks(token))
+                doorbells_task = tg.create_task(self._api.async_get_doorbells(token))
+        except* ClientResponseError as err_group:
+            err = err_group.exceptions[0]
+            if not _is_api_overloaded_error(err):
+                raise err  # noqa: B904
+            # The august api sometimes rejects concurrent requests so
+            # fall back to making them one at a time before giving up
+            user_data = await self._api.async_get_user(token)
+            locks = await self._api.async_get_operable_locks(token)
+            doorbells = await self._api.async_get_doorbells(token)
+        except* Exception as err_group:
+            raise err_group.exceptions[0]  # noqa: B904
+        else:
+            user_data = user_task.result()
+            locks = locks_task.result()
+            doorbells = doorbells_task.result()
         if not doorbells:
             doorbells = []
         if not locks:
             locks = []
 
+        devices: tuple[Lock | Doorbell, ...] = (*locks, *doorbells)
         self._doorbells_by_id = {device.device_id: device for device in doorbells}
         self._locks_by_id = {device.device_id: device for device in locks}
-        self._house_ids = {device.house_id for device in chain(locks, doorbells)}
+        self._device_name_by_id = {
+            device.device_id: device.device_name for device in devices
+        }
+        self._house_ids = set(map(_get_house_id, devices))
 
         await self._async_refresh_device_detail_by_ids(
-            [device.device_id for device in chain(locks, doorbells)]
+            [device.device_id for device in devices]
         )
 
         # We remove all devices that we are missing
@@ -201,30 +256,43 @@ class AugustData(AugustSubscriberMixin):
         # We don't care if this fails because we only want to wake
         # locks that are actually online anyways and they will be
         # awake when they come back online
-        for result in await asyncio.gather(
-            *[
-                self.async_status_async(
-                    device_id, bool(detail.bridge and detail.bridge.hyper_bridge)
-                )
-                for device_id, detail in self._device_detail_by_id.items()
-                if device_id in self._locks_by_id
-            ],
-            return_exceptions=True,
-        ):
-            if isinstance(result, Exception) and not isinstance(
-                result, (TimeoutError, ClientResponseError, CannotConnect)
-            ):
-                _LOGGER.warning(
-                    "Unexpected exception during initial sync: %s",
-                    result,
-                    exc_info=result,
+        async with asyncio.TaskGroup() as tg:
+            for device_id in self._locks_by_id:
+                tg.create_task(
+                    self._async_initial_sync_device(
+                        device_id, self._hyper_bridge_by_id.get(device_id, False)
+                    )
                 )
 
+    async def _async_initial_sync_device(
+        self, device_id: str, hyper_bridge: bool
+    ) -> None:
+        """Request an initial sync for a single lock.
+
+        Errors are handled here instead of being raised into the
+        task group so they do not cancel the other requests.
+        """
+        try:
+            await self.async_status_async(device_id, hyper_bridge)
+        except (TimeoutError, ClientResponseError, CannotConnect):
+            pass
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning(
+                "Unexpected exception during initial sync: %s",
+                err,
+                exc_info=err,
+            )
+
     @callback
     def async_pubnub_message(
         self, device_id: str, date_time: datetime, message: dict[str, Any]
     ) -> None:
         """Process a pubnub message."""
+        # Drop retransmits of a message we have already processed, every
+        # delivery of a message carries the timetoken it was published with
+        if self._last_message_time_by_device_id.get(device_id) == date_time:
+            return
+        self._last_message_time_by_device_id[device_id] = date_time
         device = self.get_device_detail(device_id)
         activities = activities_from_pubnub_message(device, date_time, message)
         activity_stream = self.activity_stream
@@ -237,6 +305,7 @@ class AugustData(AugustSubscriberMixin):
     @callback
     def async_stop(self) -> None:
         """Stop the subscriptions."""
+        self._token_unsub()
         if self._pubnub_unsub:
             self._pubnub_unsub()
         self.activity_stream.async_stop()
@@ -256,22 +325,42 @@ class AugustData(AugustSubscriberMixin):
         return self._device_detail_by_id[device_id]
 
     async def _async_refresh(self, time: datetime) -> None:
-        await self._async_refresh_device_detail_by_ids(self._subscriptions.keys())
+        await self._async_refresh_device_detail_by_ids(tuple(self._subscriptions))
 
     async def _async_refresh_device_detail_by_ids(
-        self, device_ids_list: Iterable[str]
+        self, device_ids_list: Sequence[str]
     ) -> None:
-        """Refresh each device in sequence.
+        """Refresh devices concurrently.
 
-        This used to be a gather but it was less reliable with august's
-        recent api changes.
+        The number of requests in flight is limited since the august
+        api has been less reliable when flooded with requests. If an
+        unexpected error escapes a refresh the remaining refreshes are
+        cancelled and the first error is raised.
+        """
+        token = self._token
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DETAIL_REFRESHES)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for device_id in device_ids_list:
+                    tg.create_task(
+                        self._async_refresh_device_detail_by_id_limited(
+                            semaphore, token, device_id
+                        )
+                    )
+        except* Exception as err_group:
+            raise err_group.exceptions[0]  # noqa: B904
+
+    async def _async_refresh_device_detail_by_id_limited(
+        self, semaphore: asyncio.Semaphore, token: str, device_id: str
+    ) -> None:
+        """Refresh a device while holding the semaphore.
 
         The august api has been timing out for some devices so
         we want the ones that it isn't timing out for to keep working.
         """
-        for device_id in device_ids_list:
+        async with semaphore:
             try:
-                await self._async_refresh_device_detail_by_id(device_id)
+                await self._async_refresh_device_detail_by_id(token, device_id)
             except TimeoutError:
                 _LOGGER.warning(
                     "Timed out calling august api during refresh of device: %s",
@@ -287,28 +376,30 @@ class AugustData(AugustSubscriberMixin):
     async def refresh_camera_by_id(self, device_id: str) -> None:
         """Re-fetch doorbell/camera data from API."""
         await self._async_update_device_detail(
+            self._token,
             self._doorbells_by_id[device_id],
             self._api.async_get_doorbell_detail,
         )
 
-    async def _async_refresh_device_detail_by_id(self, device_id: str) -> None:
+    async def _async_refresh_device_detail_by_id(
+        self, token: str, device_id: str
+    ) -> None:
         if device_id in self._locks_by_id:
+            saved_attrs = None
             if self.activity_stream and self.activity_stream.pubnub.connected:
                 saved_attrs = _save_live_attrs(self._device_detail_by_id[device_id])
             await self._async_update_device_detail(
-                self._locks_by_id[device_id], self._api.async_get_lock_detail
+                token, self._locks_by_id[device_id], self._api.async_get_lock_detail
             )
-            if self.activity_stream and self.activity_stream.pubnub.connected:
+            if saved_attrs is not None:
                 _restore_live_attrs(self._device_detail_by_id[device_id], saved_attrs)
             # keypads are always attached to locks
-            if (
-                device_id in self._device_detail_by_id
-                and self._device_detail_by_id[device_id].keypad is not None
-            ):
-                keypad = self._device_detail_by_id[device_id].keypad
+            detail = self._device_detail_by_id.get(device_id)
+            if detail is not None and (keypad := detail.keypad) is not None:
                 self._device_detail_by_id[keypad.device_id] = keypad
         elif device_id in self._doorbells_by_id:
             await self._async_update_device_detail(
+                token,
                 self._doorbells_by_id[device_id],
                 self._api.async_get_doorbell_detail,
             )
@@ -319,6 +410,7 @@ class AugustData(AugustSubscriberMixin):
 
     async def _async_update_device_detail(
         self,
+        token: str,
         device: Doorbell | Lock,
         api_call: Callable[
             [str, str], Coroutine[Any, Any, DoorbellDetail | LockDetail]
@@ -329,7 +421,7 @@ class AugustData(AugustSubscriberMixin):
         _LOGGER.debug("Started retrieving detail for %s (%s)", device_name, device_id)
 
         try:
-            detail = await api_call(self._august_gateway.access_token, device_id)
+            detail = await api_call(token, device_id)
         except ClientError as ex:
             _LOGGER.error(
                 "Request error trying to retrieve %s details for %s. %s",
@@ -340,10 +432,18 @@ class AugustData(AugustSubscriberMixin):
         _LOGGER.debug("Completed retrieving detail for %s (%s)", device_name, device_id)
         # If the key changes after startup we need to trigger a
         # discovery to keep it up to date
-        if isinstance(detail, LockDetail) and detail.offline_key:
+        if (
+            isinstance(detail, LockDetail)
+            and detail.offline_key
+            and _offline_key_changed(self._device_detail_by_id.get(device_id), detail)
+        ):
             _async_trigger_ble_lock_discovery(self._hass, [detail])
 
         self._device_detail_by_id[device_id] = detail
+        if isinstance(detail, LockDetail):
+            self._hyper_bridge_by_id[device_id] = bool(
+                detail.bridge and detail.bridge.hyper_bridge
+            )
 
     def get_device(self, device_id: str) -> Doorbell | Lock | None:
         """Get a device by id."""
@@ -351,16 +451,14 @@ class AugustData(AugustSubscriberMixin):
 
     def _get_device_name(self, device_id: str) -> str | None:
         """Return doorbell or lock name as August has it stored."""
-        if device := self.get_device(device_id):
-            return device.device_name
-        return None
+        return self._device_name_by_id.get(device_id)
 
     async def async_lock(self, device_id: str) -> list[ActivityTypes]:
         """Lock the device."""
         return await self._async_call_api_op_requires_bridge(
             device_id,
             self._api.async_lock_return_activities,
-            self._august_gateway.access_token,
+            self._token,
             device_id,
         )
 
@@ -369,7 +467,7 @@ class AugustData(AugustSubscriberMixin):
         return await self._async_call_api_op_requires_bridge(
             device_id,
             self._api.async_status_async,
-            self._august_gateway.access_token,
+            self._token,
             device_id,
             hyper_bridge,
         )
@@ -379,7 +477,7 @@ class AugustData(AugustSubscriberMixin):
         return await self._async_call_api_op_requires_bridge(
             device_id,
             self._api.async_lock_async,
-            self._august_gateway.access_token,
+            self._token,
             device_id,
             hyper_bridge,
         )
@@ -389,7 +487,7 @@ class AugustData(AugustSubscriberMixin):
         return await self._async_call_api_op_requires_bridge(
             device_id,
             self._api.async_unlock_return_activities,
-            self._august_gateway.access_token,
+            self._token,
             device_id,
         )
 
@@ -398,7 +496,7 @@ class AugustData(AugustSubscriberMixin):
         return await self._async_call_api_op_requires_bridge(
             device_id,
             self._api.async_unlock_async,
-            self._august_gateway.access_token,
+            self._token,
             device_id,
             hyper_bridge,
         )
@@ -422,65 +520,78 @@ class AugustData(AugustSubscriberMixin):
         return ret
 
     def _remove_inoperative_doorbells(self) -> None:
-        for doorbell in list(self.doorbells):
-            device_id = doorbell.device_id
-            if self._device_detail_by_id.get(device_id):
-                continue
+        doorbells_by_id = self._doorbells_by_id
+        for device_id in doorbells_by_id.keys() - self._device_detail_by_id.keys():
             _LOGGER.info(
                 (
                     "The doorbell %s could not be setup because the system could not"
                     " fetch details about the doorbell"
                 ),
-                doorbell.device_name,
+                doorbells_by_id.pop(device_id).device_name,
             )
-            del self._doorbells_by_id[device_id]
 
     def _remove_inoperative_locks(self) -> None:
         # Remove non-operative locks as there must
         # be a bridge (August Connect) for them to
         # be usable
-        for lock in list(self.locks):
-            device_id = lock.device_id
-            lock_detail = self._device_detail_by_id.get(device_id)
-            if lock_detail is None:
-                _LOGGER.info(
-                    (
-                        "The lock %s could not be setup because the system could not"
-                        " fetch details about the lock"
-                    ),
-                    lock.device_name,
-                )
-            elif lock_detail.bridge is None:
-                _LOGGER.info(
-                    (
-                        "The lock %s could not be setup because it does not have a"
-                        " bridge (Connect)"
-                    ),
-                    lock.device_name,
-                )
-                del self._device_detail_by_id[device_id]
-            # Bridge may come back online later so we still add the device since we will
-            # have a pubnub subscription to tell use when it recovers
-            else:
-                continue
-            del self._locks_by_id[device_id]
+        for device_id in self._locks_by_id.keys() - self._device_detail_by_id.keys():
+            _LOGGER.info(
+                (
+                    "The lock %s could not be setup because the system could not"
+                    " fetch details about the lock"
+                ),
+                self._locks_by_id.pop(device_id).device_name,
+            )
+        # A lock with an offline bridge is still added since the bridge may come
+        # back online later and we will have a pubnub subscription to tell us
+        for device_id in [
+            device_id
+            for device_id in self._locks_by_id
+            if self._device_detail_by_id[device_id].bridge is None
+        ]:
+            _LOGGER.info(
+                (
+                    "The lock %s could not be setup because it does not have a"
+                    " bridge (Connect)"
+                ),
+                self._locks_by_id.pop(device_id).device_name,
+            )
+            del self._device_detail_by_id[device_id]
+
+
+def _is_api_overloaded_error(err: ClientResponseError) -> bool:
+    """Return if the api rejected a request because it is overloaded."""
+    return (
+        err.status == HTTPStatus.TOO_MANY_REQUESTS
+        or err.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+    )
+
+
+def _offline_key_changed(
+    previous_detail: DoorbellDetail | LockDetail | None, detail: LockDetail
+) -> bool:
+    """Return if the offline key or slot differs from the previous detail."""
+    return not isinstance(previous_detail, LockDetail) or (
+        previous_detail.offline_key,
+        previous_detail.offline_slot,
+    ) != (detail.offline_key, detail.offline_slot)
 
 
-def _save_live_attrs(lock_detail: DoorbellDetail | LockDetail) -> dict[str, Any]:
+def _save_live_attrs(lock_detail: DoorbellDetail | LockDetail) -> tuple[Any, ...]:
     """Store the attributes that the lock detail api may have an invalid cache for.
 
     Since we are connected to pubnub we may have more current data
     then the api so we want to restore the most current data after
     updating battery state etc.
     """
-    return {attr: getattr(lock_detail, attr) for attr in API_CACHED_ATTRS}
+    return _get_live_attrs(lock_detail)
 
 
 def _restore_live_attrs(
-    lock_detail: DoorbellDetail | LockDetail, attrs: dict[str, Any]
+    lock_detail: DoorbellDetail | LockDetail, attrs: tuple[Any, ...]
 ) -> None:
     """Restore the non-cache attributes after a cached update."""
-    for attr, value in attrs.items():
+    for attr, value in zip(API_CACHED_ATTRS, attrs, strict=True):
         setattr(lock_detail, attr, value)
 
 
@@ -488,9 +599,9 @@ async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: AugustConfigEntry, device_entry: dr.DeviceEntry
 ) -> bool:
     """Remove august config entry from a device if its no longer present."""
+    data = config_entry.runtime_data
     return not any(
-        identifier
+        data.get_device(identifier[1])
         for identifier in device_entry.identifiers
         if identifier[0] == DOMAIN
-        and config_entry.runtime_data.get_device(identifier[1])
     )
@@ -5,7 +5,6 @@ from dataclasses import dataclass
 import logging
 from typing import Any
 
-import aiohttp
 import voluptuous as vol
 from yalexs.authenticator import ValidationResult
 from yalexs.const import BRANDS, DEFAULT_BRAND
@@ -25,7 +24,7 @@ from .const import (
 )
 from .exceptions import CannotConnect, InvalidAuth, RequireValidation
 from .gateway import AugustGateway
-from .util import async_create_august_clientsession
+from .util import async_get_august_clientsession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -83,7 +82,6 @@ class AugustConfigFlow(ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Store an AugustGateway()."""
         self._august_gateway: AugustGateway | None = None
-        self._aiohttp_session: aiohttp.ClientSession | None = None
         self._user_auth_details: dict[str, Any] = {}
         self._needs_reset = True
         self._mode: str | None = None
@@ -163,15 +161,18 @@ class AugustConfigFlow(ConfigFlow, domain=DOMAIN):
         """Set up the gateway."""
         if self._august_gateway is not None:
             return self._august_gateway
-        self._aiohttp_session = async_create_august_clientsession(self.hass)
-        self._august_gateway = AugustGateway(self.hass, self._aiohttp_session)
+        self._august_gateway = AugustGateway(
+            self.hass, async_get_august_clientsession(self.hass)
+        )
         return self._august_gateway
 
     @callback
     def _async_shutdown_gateway(self) -> None:
-        """Shutdown the gateway."""
-        if self._aiohttp_session is not None:
-            self._aiohttp_session.detach()
+        """Shutdown the gateway.
+
+        The session is shared with the loaded config entries
+        so it must not be detached here.
+        """
         self._august_gateway = None
 
     async def async_step_reauth(
@@ -2,7 +2,10 @@
 
 from datetime import timedelta
 
+from aiohttp import ClientSession
+
 from homeassistant.const import Platform
+from homeassistant.util.hass_dict import HassKey
 
 DEFAULT_TIMEOUT = 25
 
@@ -23,6 +26,8 @@ DEFAULT_AUGUST_CONFIG_FILE = ".august.conf"
 DEFAULT_NAME = "August"
 DOMAIN = "august"
 
+DATA_AUGUST_CLIENTSESSION: HassKey[ClientSession] = HassKey(f"{DOMAIN}_clientsession")
+
 OPERATION_METHOD_AUTORELOCK = "autorelock"
 OPERATION_METHOD_REMOTE = "remote"
 OPERATION_METHOD_KEYPAD = "keypad"
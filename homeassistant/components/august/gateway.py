@@ -1,7 +1,7 @@
 """Handle August connection setup and authentication."""
 
 import asyncio
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from http import HTTPStatus
 import logging
 import os
@@ -15,7 +15,7 @@ from yalexs.const import DEFAULT_BRAND
 from yalexs.exceptions import AugustApiAIOHTTPError
 
 from homeassistant.const import CONF_PASSWORD, CONF_TIMEOUT, CONF_USERNAME
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 
 from .const import (
     CONF_ACCESS_TOKEN_CACHE_FILE,
@@ -45,12 +45,28 @@ class AugustGateway:
         self._token_refresh_lock = asyncio.Lock()
         self._hass: HomeAssistant = hass
         self._config: Mapping[str, Any] | None = None
+        self._access_token_listeners: list[Callable[[str], None]] = []
 
     @property
     def access_token(self) -> str:
         """Access token for the api."""
         return self.authentication.access_token
 
+    @callback
+    def async_subscribe_access_token(
+        self, token_callback: Callable[[str], None]
+    ) -> CALLBACK_TYPE:
+        """Add a callback that is called with the new token when it is refreshed.
+
+        Returns a callable that can be used to unsubscribe.
+        """
+        self._access_token_listeners.append(token_callback)
+
+        def _unsubscribe() -> None:
+            self._access_token_listeners.remove(token_callback)
+
+        return _unsubscribe
+
     def config_entry(self) -> dict[str, Any]:
         """Config entry."""
         assert self._config is not None
@@ -159,3 +175,5 @@ class AugustGateway:
                 refreshed_authentication.access_token_expires,
             )
             self.authentication = refreshed_authentication
+            for token_callback in self._access_token_listeners:
+                token_callback(refreshed_authentication.access_token)
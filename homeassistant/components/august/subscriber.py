@@ -13,6 +13,14 @@ from homeassistant.helpers.event import async_track_time_interval
 class AugustSubscriberMixin:
     """Base implementation for a subscriber."""
 
+    __slots__ = (
+        "_hass",
+        "_update_interval",
+        "_subscriptions",
+        "_unsub_interval",
+        "_stop_interval",
+    )
+
     def __init__(self, hass: HomeAssistant, update_interval: timedelta) -> None:
         """Initialize an subscriber."""
         super().__init__()
@@ -4,12 +4,39 @@ import socket
 
 import aiohttp
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import aiohttp_client
 
+from .const import DATA_AUGUST_CLIENTSESSION
+
+
+@callback
+def async_get_august_clientsession(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the shared aiohttp session for the august integration.
+
+    The session is created on first use, or again if the stored one
+    was closed, and shared between all config entries and config flows
+    so connections to the api can be reused.
+    """
+    session = hass.data.get(DATA_AUGUST_CLIENTSESSION)
+    if session is not None and not session.closed:
+        return session
+    session = _async_create_august_clientsession(hass)
+    hass.data[DATA_AUGUST_CLIENTSESSION] = session
+
+    @callback
+    def _async_close_clientsession(_: Event) -> None:
+        """Detach the shared session when Home Assistant closes."""
+        hass.data.pop(DATA_AUGUST_CLIENTSESSION, None)
+        session.detach()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_clientsession)
+    return session
+
 
 @callback
-def async_create_august_clientsession(hass: HomeAssistant) -> aiohttp.ClientSession:
+def _async_create_august_clientsession(hass: HomeAssistant) -> aiohttp.ClientSession:
     """Create an aiohttp session for the august integration."""
     # Create an aiohttp session instead of using the default one since the
     # default one is likely to trigger august's WAF if another integration
@@ -21,4 +48,9 @@ def async_create_august_clientsession(hass: HomeAssistant) -> aiohttp.ClientSess
     # When https://github.com/aio-libs/aiohttp/issues/4451 is implemented
     # we can allow IPv6 again
     #
-    return aiohttp_client.async_create_clientsession(hass, family=socket.AF_INET)
+    # auto_cleanup is disabled since the session outlives any single
+    # config entry and is instead detached when Home Assistant closes
+    #
+    return aiohttp_client.async_create_clientsession(
+        hass, auto_cleanup=False, family=socket.AF_INET
+    )
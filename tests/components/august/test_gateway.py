@@ -40,10 +40,13 @@ async def _patched_refresh_access_token(
     mocked_config = _mock_get_config()
     await august_gateway.async_setup(mocked_config[DOMAIN])
     await august_gateway.async_authenticate()
+    token_callback = MagicMock()
+    august_gateway.async_subscribe_access_token(token_callback)
 
     should_refresh_mock.return_value = False
     await august_gateway.async_refresh_access_token_if_needed()
     refresh_access_token_mock.assert_not_called()
+    token_callback.assert_not_called()
 
     should_refresh_mock.return_value = True
     refresh_access_token_mock.return_value = _mock_august_authentication(
@@ -53,3 +56,4 @@ async def _patched_refresh_access_token(
     refresh_access_token_mock.assert_called()
     assert august_gateway.access_token == new_token
     assert august_gateway.authentication.access_token_expires == new_token_expire_time
+    token_callback.assert_called_once_with(new_token)
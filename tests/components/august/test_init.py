@@ -1,16 +1,31 @@
 """The tests for the august platform."""
 
-from unittest.mock import Mock, patch
+import asyncio
+from copy import deepcopy
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 from aiohttp import ClientResponseError
+import pytest
 from yalexs.authenticator_common import AuthenticationState
 from yalexs.exceptions import AugustApiAIOHTTPError
-
-from homeassistant.components.august.const import DOMAIN
+from yalexs.lock import LockDetail
+
+from homeassistant.components.august import MAX_CONCURRENT_DETAIL_REFRESHES
+from homeassistant.components.august.const import (
+    CONF_BRAND,
+    CONF_LOGIN_METHOD,
+    DOMAIN,
+    MIN_TIME_BETWEEN_DETAIL_UPDATES,
+)
+from homeassistant.components.august.gateway import AugustGateway
+from homeassistant.components.august.util import async_get_august_clientsession
 from homeassistant.components.lock import DOMAIN as LOCK_DOMAIN
-from homeassistant.config_entries import ConfigEntryState
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_CLOSE,
     SERVICE_LOCK,
     SERVICE_UNLOCK,
     STATE_LOCKED,
@@ -20,9 +35,12 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
 from .mocks import (
+    _create_august_api_with_devices,
     _create_august_with_devices,
+    _load_json_fixture,
     _mock_august_authentication,
     _mock_doorsense_enabled_august_lock_detail,
     _mock_doorsense_missing_august_lock_detail,
@@ -32,7 +50,7 @@ from .mocks import (
     _mock_operative_august_lock_detail,
 )
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, async_fire_time_changed
 from tests.typing import WebSocketGenerator
 
 
@@ -162,6 +180,136 @@ async def test_lock_throws_august_api_http_error(hass: HomeAssistant) -> None:
     )
 
 
+async def test_setup_falls_back_to_sequential_requests(hass: HomeAssistant) -> None:
+    """Test setup retries the initial requests one at a time if they fail together."""
+    august_operative_lock = await _mock_operative_august_lock_detail(hass)
+    doorbell_calls = 0
+
+    def _get_doorbells_side_effect(access_token):
+        nonlocal doorbell_calls
+        doorbell_calls += 1
+        if doorbell_calls == 1:
+            raise ClientResponseError(None, None, status=429)
+        return []
+
+    config_entry = await _create_august_with_devices(
+        hass,
+        [august_operative_lock],
+        api_call_side_effects={"get_doorbells": _get_doorbells_side_effect},
+    )
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert doorbell_calls == 2
+    lock_a6697750d607098bae8d6baa11ef8063_name = hass.states.get(
+        "lock.a6697750d607098bae8d6baa11ef8063_name"
+    )
+    assert lock_a6697750d607098bae8d6baa11ef8063_name.state == STATE_LOCKED
+
+    # Errors that do not mean the api is overloaded, such as auth failures,
+    # are raised right away instead of being retried
+    api_instance = MagicMock(name="Api")
+    api_instance.async_get_user = AsyncMock(return_value={"UserID": "abc"})
+    api_instance.async_get_operable_locks = AsyncMock(return_value=[])
+    api_instance.async_get_doorbells = AsyncMock(
+        side_effect=ClientResponseError(None, None, status=401)
+    )
+    auth_failure_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=_mock_get_config()[DOMAIN],
+        title="August august",
+    )
+    auth_failure_entry.add_to_hass(hass)
+
+    with (
+        patch(
+            "homeassistant.components.august.gateway.ApiAsync",
+            return_value=api_instance,
+        ),
+        patch(
+            "homeassistant.components.august.gateway.AuthenticatorAsync.async_authenticate",
+            return_value=_mock_august_authentication(
+                "original_token", 1234, AuthenticationState.AUTHENTICATED
+            ),
+        ),
+    ):
+        await hass.config_entries.async_setup(auth_failure_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert auth_failure_entry.state is ConfigEntryState.SETUP_RETRY
+    assert api_instance.async_get_doorbells.await_count == 1
+
+
+async def test_refresh_limits_concurrent_requests(hass: HomeAssistant) -> None:
+    """Test device details are refreshed concurrently up to the limit."""
+    lock_json = await _load_json_fixture(hass, "get_lock.online.json")
+    lock_details = []
+    for index in range(MAX_CONCURRENT_DETAIL_REFRESHES + 2):
+        device_json = deepcopy(lock_json)
+        device_json["LockID"] = f"lock{index}"
+        device_json["LockName"] = f"Lock {index}"
+        lock_details.append(LockDetail(device_json))
+    details_by_id = {detail.device_id: detail for detail in lock_details}
+    release = asyncio.Event()
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def _get_lock_detail_side_effect(access_token, device_id):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        if in_flight == MAX_CONCURRENT_DETAIL_REFRESHES:
+            # Release on the next loop iteration so any request that
+            # is not held back by the limit gets a chance to start
+            asyncio.get_running_loop().call_soon(release.set)
+        await release.wait()
+        in_flight -= 1
+        return details_by_id[device_id]
+
+    config_entry = await _create_august_with_devices(
+        hass,
+        lock_details,
+        api_call_side_effects={"get_lock_detail": _get_lock_detail_side_effect},
+    )
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert peak_in_flight == MAX_CONCURRENT_DETAIL_REFRESHES
+    assert len(hass.states.async_entity_ids(LOCK_DOMAIN)) == len(lock_details)
+
+
+async def test_refresh_unexpected_error_cancels_other_refreshes(
+    hass: HomeAssistant,
+) -> None:
+    """Test an unexpected refresh error cancels the other refreshes and is raised."""
+    doorsense_lock = await _mock_doorsense_enabled_august_lock_detail(hass)
+    august_operative_lock = await _mock_operative_august_lock_detail(hass)
+    config_entry, api_instance = await _create_august_api_with_devices(
+        hass, [doorsense_lock, august_operative_lock]
+    )
+    started = asyncio.Event()
+    cancelled = False
+
+    async def _get_lock_detail_side_effect(access_token, device_id):
+        nonlocal cancelled
+        if device_id == august_operative_lock.device_id:
+            await started.wait()
+            raise ValueError("unexpected")
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    api_instance.async_get_lock_detail.side_effect = _get_lock_detail_side_effect
+
+    with pytest.raises(ValueError, match="unexpected"):
+        await config_entry.runtime_data._async_refresh_device_detail_by_ids(
+            [doorsense_lock.device_id, august_operative_lock.device_id]
+        )
+
+    assert cancelled
+
+
 async def test_inoperative_locks_are_filtered_out(hass: HomeAssistant) -> None:
     """Ensure inoperative locks do not get setup."""
     august_operative_lock = await _mock_operative_august_lock_detail(hass)
@@ -360,6 +508,67 @@ async def test_load_unload(hass: HomeAssistant) -> None:
     await hass.async_block_till_done()
 
 
+async def test_clientsession_is_shared(hass: HomeAssistant) -> None:
+    """Test setup and config flows share one session that is detached on close."""
+    august_operative_lock = await _mock_operative_august_lock_detail(hass)
+    with patch(
+        "homeassistant.components.august.AugustGateway", wraps=AugustGateway
+    ) as mock_setup_gateway:
+        config_entry, api_instance = await _create_august_api_with_devices(
+            hass, [august_operative_lock]
+        )
+    setup_session = mock_setup_gateway.mock_calls[0].args[1]
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    with (
+        patch(
+            "homeassistant.components.august.config_flow.AugustGateway",
+            wraps=AugustGateway,
+        ) as mock_flow_gateway,
+        patch(
+            "homeassistant.components.august.gateway.AugustGateway.async_authenticate",
+            return_value=True,
+        ),
+        patch(
+            "homeassistant.components.august.async_setup_entry",
+            return_value=True,
+        ),
+    ):
+        await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_BRAND: "august",
+                CONF_LOGIN_METHOD: "email",
+                CONF_USERNAME: "my@email.tld",
+                CONF_PASSWORD: "test-password",
+            },
+        )
+        await hass.async_block_till_done()
+    flow_session = mock_flow_gateway.mock_calls[0].args[1]
+
+    assert setup_session is flow_session
+    assert async_get_august_clientsession(hass) is setup_session
+    # Finishing the flow must not close the session the loaded entry uses
+    assert not setup_session.closed
+    assert config_entry.state is ConfigEntryState.LOADED
+    data = {ATTR_ENTITY_ID: "lock.a6697750d607098bae8d6baa11ef8063_name"}
+    await hass.services.async_call(LOCK_DOMAIN, SERVICE_LOCK, data, blocking=True)
+    assert api_instance.async_lock_return_activities.mock_calls
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert setup_session.closed
+    new_session = async_get_august_clientsession(hass)
+    assert new_session is not setup_session
+
+    # A stored session that was closed is replaced
+    new_session.detach()
+    assert async_get_august_clientsession(hass) is not new_session
+
+
 async def test_load_triggers_ble_discovery(
     hass: HomeAssistant, mock_discovery: Mock
 ) -> None:
@@ -384,6 +593,28 @@ async def test_load_triggers_ble_discovery(
     }
 
 
+async def test_refresh_does_not_repeat_ble_discovery(
+    hass: HomeAssistant, mock_discovery: Mock
+) -> None:
+    """Test that refreshing a lock with an unchanged offline key skips discovery."""
+
+    august_lock_with_key = await _mock_lock_with_offline_key(hass)
+
+    config_entry, api_instance = await _create_august_api_with_devices(
+        hass, [august_lock_with_key]
+    )
+    await hass.async_block_till_done()
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert len(mock_discovery.mock_calls) == 1
+    detail_calls = len(api_instance.async_get_lock_detail.mock_calls)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + MIN_TIME_BETWEEN_DETAIL_UPDATES)
+    await hass.async_block_till_done()
+
+    assert len(api_instance.async_get_lock_detail.mock_calls) > detail_calls
+    assert len(mock_discovery.mock_calls) == 1
+
+
 async def test_device_remove_devices(
     hass: HomeAssistant,
     hass_ws_client: WebSocketGenerator,
@@ -1,11 +1,12 @@
 """The lock tests for the august platform."""
 
 import datetime
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from aiohttp import ClientResponseError
 from freezegun.api import FrozenDateTimeFactory
 import pytest
+from yalexs.pubnub_activity import activities_from_pubnub_message
 from yalexs.pubnub_async import AugustPubNub
 
 from homeassistant.components.august.activity import INITIAL_LOCK_RESYNC_TIME
@@ -449,3 +450,58 @@ async def test_lock_update_via_pubnub(hass: HomeAssistant) -> None:
 
     await hass.config_entries.async_unload(config_entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_lock_update_via_pubnub_drops_retransmits(hass: HomeAssistant) -> None:
+    """Test a pubnub message delivered twice is only processed once."""
+    lock_one = await _mock_doorsense_enabled_august_lock_detail(hass)
+    pubnub = AugustPubNub()
+
+    activities = await _mock_activities_from_fixture(hass, "get_activity.lock.json")
+    config_entry = await _create_august_with_devices(
+        hass, [lock_one], activities=activities, pubnub=pubnub
+    )
+    pubnub.connected = True
+
+    unlocking_message = Mock(
+        channel=lock_one.pubsub_channel,
+        timetoken=(dt_util.utcnow().timestamp() + 1) * 10000000,
+        message={
+            "status": "kAugLockState_Unlocking",
+        },
+    )
+    with patch(
+        "homeassistant.components.august.activities_from_pubnub_message",
+        wraps=activities_from_pubnub_message,
+    ) as mock_activities_from_pubnub_message:
+        pubnub.message(pubnub, unlocking_message)
+        await hass.async_block_till_done()
+        pubnub.message(pubnub, unlocking_message)
+        await hass.async_block_till_done()
+
+        assert len(mock_activities_from_pubnub_message.mock_calls) == 1
+        lock_online_with_doorsense_name = hass.states.get(
+            "lock.online_with_doorsense_name"
+        )
+        assert lock_online_with_doorsense_name.state == STATE_UNLOCKING
+
+        pubnub.message(
+            pubnub,
+            Mock(
+                channel=lock_one.pubsub_channel,
+                timetoken=(dt_util.utcnow().timestamp() + 2) * 10000000,
+                message={
+                    "status": "kAugLockState_Locking",
+                },
+            ),
+        )
+        await hass.async_block_till_done()
+
+        assert len(mock_activities_from_pubnub_message.mock_calls) == 2
+        lock_online_with_doorsense_name = hass.states.get(
+            "lock.online_with_doorsense_name"
+        )
+        assert lock_online_with_doorsense_name.state == STATE_LOCKING
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()